@@ -1,5 +1,5 @@
 import dash
-from dash import dcc, html, Input, Output, State, callback
+from dash import dcc, html, Input, Output, State, callback, ClientsideFunction
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import folium
@@ -9,7 +9,12 @@ import pandas as pd
 from pathlib import Path
 import sys
 import os
-import json
+import functools
+import hashlib
+import time
+import diskcache
+import orjson
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Tuple, Dict, Any, Optional, Union
 
@@ -22,12 +27,22 @@ if project_root not in sys.path:
 from routing.pathfinder import MaritimePathFinder
 from routing.predefined_routes import get_predefined_route, list_predefined_routes
 from weather.simulator import WeatherSimulator
-from utils import create_folium_map, format_weather_summary, parse_coordinates, parse_waypoints
+from utils import build_folium_map, create_folium_map, format_weather_summary, parse_coordinates, parse_waypoints, simplify_path
 
 # Initialize services
 path_finder = MaritimePathFinder()
 weather_simulator = WeatherSimulator(seed=42)
 
+# Rendered routes shared across restarts and workers, keyed by the route spec.
+# Entries embed simulated weather, so they expire, and the key carries a version
+# to bump whenever the cached view's contents or layout change.
+route_html_cache = diskcache.Cache(os.path.join('data', 'route_html_cache'))
+ROUTE_CACHE_VERSION = 1
+ROUTE_CACHE_TTL_SECONDS = 15 * 60
+
+# Route files are written off the request thread; the callback never needs the path
+route_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='route-writer')
+
 # Ensure data directory exists
 os.makedirs('data', exist_ok=True)
 os.makedirs('data/routes', exist_ok=True)
@@ -45,6 +60,9 @@ server = app.server
 # Default coordinates for initial map view
 DEFAULT_COORDS = [(40.7128, -74.0060), (51.5074, -0.1278)]  # NY to London
 
+# Planned speed used for weather timing along the route and shown on the speed gauge
+ROUTE_SPEED_KNOTS = 15.0
+
 # App layout
 app.layout = dbc.Container([
     # Title
@@ -268,7 +286,8 @@ app.layout = dbc.Container([
 
 # Callbacks
 @app.callback(
-    Output('map', 'srcDoc'),
+    [Output('map', 'srcDoc'),
+     Output('route-data', 'data')],
     [Input('calculate-route', 'n_clicks'),
      Input('predefined-route', 'value')],
     [State('start-port', 'value'),
@@ -277,11 +296,11 @@ app.layout = dbc.Container([
      State('route-type', 'value')]
 )
 def update_map(n_clicks, predefined_route, start_port, end_port, waypoints, route_type):
-    """Update the map with the calculated route."""
+    """Update the map and the route-data store with the calculated route."""
     # Get the context to determine which input triggered the callback
     ctx = dash.callback_context
     if not ctx.triggered:
-        return create_folium_map(DEFAULT_COORDS)
+        return create_folium_map(DEFAULT_COORDS), None
     
     triggered_id = ctx.triggered[0]['prop_id'].split('.')[0]
     
@@ -300,89 +319,140 @@ def update_map(n_clicks, predefined_route, start_port, end_port, waypoints, rout
             if dash.callback_context.outputs_list[1]['id'] == 'end-port':
                 dash.callback_context.outputs_list[1]['value'] = f"{end[0]}, {end[1]}"
         else:
-            return create_folium_map(DEFAULT_COORDS)
+            return create_folium_map(DEFAULT_COORDS), None
     # Handle manual route calculation
     elif triggered_id == 'calculate-route':
         if not start_port or not end_port:
-            return create_folium_map(DEFAULT_COORDS)
+            return create_folium_map(DEFAULT_COORDS), None
         try:
             start = parse_coordinates(start_port)
             end = parse_coordinates(end_port)
             waypoints = parse_waypoints(waypoints) if waypoints else []
         except ValueError as e:
-            return create_folium_map(DEFAULT_COORDS)
+            return create_folium_map(DEFAULT_COORDS), None
     else:
-        return create_folium_map(DEFAULT_COORDS)
+        return create_folium_map(DEFAULT_COORDS), None
     
     # Parse waypoints if any
     waypoint_list = waypoints if isinstance(waypoints, list) else (parse_waypoints(waypoints) if waypoints else [])
     
     try:
-        # Calculate route
-        route = path_finder.find_path(start, end, waypoint_list, path_type=route_type if route_type else 'optimal')
-        
-        # Get weather along the route
-        weather_data = weather_simulator.get_weather_along_route(route['path'])
-        
-        # Save route data
-        route_data = {
-            'start': start,
-            'end': end,
-            'waypoints': waypoint_list,
-            'path': route['path'],
-            'distance': route['distance'],
-            'weather': weather_data
-        }
-        
-        # Create map with route and waypoints
-        m = create_folium_map([start, end])
-        
-        # Add route to map
+        return _render_route_html(
+            _round_coord(start),
+            _round_coord(end),
+            tuple(_round_coord(wp) for wp in waypoint_list),
+            route_type if route_type else 'optimal',
+            _cache_window()
+        )
+    except Exception as e:
+        print(f"Error generating route: {str(e)}")
+        return create_folium_map(DEFAULT_COORDS), None
+
+def _round_coord(coord, ndigits: int = 4) -> Tuple[float, float]:
+    """Round a (lat, lon) pair so near-identical requests share a cache entry."""
+    return (round(float(coord[0]), ndigits), round(float(coord[1]), ndigits))
+
+def _cache_window() -> int:
+    """Index of the current TTL window; part of every cache key so both cache layers expire together."""
+    return int(time.time() // ROUTE_CACHE_TTL_SECONDS)
+
+@functools.lru_cache(maxsize=256)
+def _render_route_html(start: Tuple[float, float],
+                       end: Tuple[float, float],
+                       waypoints: Tuple[Tuple[float, float], ...],
+                       route_type: str,
+                       window: int) -> Tuple[str, Dict[str, Any]]:
+    """
+    Return the rendered route, memoized in-process and backed by the on-disk cache.
+    
+    Only a cache miss runs _build_route_view, so a route file is saved once per
+    route spec and TTL window, not on every request.
+    """
+    key = hashlib.sha1(orjson.dumps([ROUTE_CACHE_VERSION, window, start, end, waypoints, route_type])).hexdigest()
+    view = route_html_cache.get(key)
+    if view is None:
+        view = _build_route_view(start, end, waypoints, route_type)
+        route_html_cache.set(key, view, expire=ROUTE_CACHE_TTL_SECONDS)
+    return view
+
+def _build_route_view(start: Tuple[float, float],
+                      end: Tuple[float, float],
+                      waypoints: Tuple[Tuple[float, float], ...],
+                      route_type: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Calculate a route and render it.
+    
+    Returns:
+        Tuple of (map HTML, compact instrument readings for the route-data store)
+    """
+    waypoint_list = list(waypoints)
+    
+    # Calculate route
+    route = path_finder.find_path(start, end, waypoint_list, path_type=route_type)
+    
+    # Get weather along the route
+    weather_data = weather_simulator.get_weather_along_route(route['path'], speed_knots=ROUTE_SPEED_KNOTS)
+    
+    # Save route data
+    route_data = {
+        'start': start,
+        'end': end,
+        'waypoints': waypoint_list,
+        'path': route['path'],
+        'distance': route['distance_km'],
+        'weather': weather_data
+    }
+    
+    # Build the route layer in one pass and attach it to the map once
+    route_layer = folium.FeatureGroup(name='route')
+    route_elements = [
         folium.PolyLine(
-            locations=route['path'],
+            locations=simplify_path(route['path']),
             color='#1E88E5',
             weight=4,
             opacity=0.8
-        ).add_to(m)
-        
-        # Add start and end markers
+        ),
+        # Start and end markers
         folium.Marker(
             location=start,
             popup=f"Start: {start[0]:.4f}, {start[1]:.4f}",
             icon=folium.Icon(color='green', icon='ship', prefix='fa')
-        ).add_to(m)
-        
+        ),
         folium.Marker(
             location=end,
             popup=f"End: {end[0]:.4f}, {end[1]:.4f}",
             icon=folium.Icon(color='red', icon='anchor', prefix='fa')
-        ).add_to(m)
-        
-        # Add waypoints if any
-        for i, wp in enumerate(waypoint_list, 1):
-            folium.Marker(
-                location=wp,
-                popup=f"Waypoint {i}: {wp[0]:.4f}, {wp[1]:.4f}",
-                icon=folium.Icon(color='blue', icon='map-marker-alt', prefix='fa')
-            ).add_to(m)
-        
-        # Save route data to file
-        save_route_to_file(route_data)
-        
-        # Update the route data store
-        return m._repr_html_()
-        
-    except Exception as e:
-        print(f"Error generating route: {str(e)}")
-        return create_folium_map(DEFAULT_COORDS)
-
-def update_gauges(speed=0, wind_speed=0, wave_height=0):
-    """Update the gauge charts with new values."""
-    return (
-        update_speed_gauge(speed),
-        update_wind_gauge(wind_speed),
-        update_wave_gauge(wave_height)
+        )
+    ]
+    
+    # Add waypoints if any
+    route_elements.extend(
+        folium.Marker(
+            location=wp,
+            popup=f"Waypoint {i}: {wp[0]:.4f}, {wp[1]:.4f}",
+            icon=folium.Icon(color='blue', icon='map-marker-alt', prefix='fa')
+        )
+        for i, wp in enumerate(waypoint_list, 1)
     )
+    for element in route_elements:
+        route_layer.add_child(element)
+    
+    # Create map with route and waypoints
+    m = build_folium_map([start, end], extra_layers=[route_layer])
+    
+    # Save route data to file in the background
+    route_writer.submit(save_route_to_file, route_data).add_done_callback(_report_save_error)
+    
+    # Compact readings for the route-data store; the gauges only need these
+    readings = {
+        'speed': ROUTE_SPEED_KNOTS,
+        'wind': max((w['wind_speed'] for w in weather_data), default=0),
+        'wave': max((w['wave_height'] for w in weather_data), default=0),
+        'summary': format_weather_summary(weather_data),
+        'info': f"Distance: {route['distance_km']:.1f} km | Waypoints: {len(waypoint_list)}"
+    }
+    
+    return m._repr_html_(), readings
 
 def save_route_to_file(route_data: Dict[str, Any]) -> str:
     """Save route data to a JSON file."""
@@ -390,98 +460,52 @@ def save_route_to_file(route_data: Dict[str, Any]) -> str:
     filename = f"route_{timestamp}.json"
     filepath = os.path.join('data', 'routes', filename)
     
-    with open(filepath, 'w') as f:
-        json.dump(route_data, f, indent=2)
+    with open(filepath, 'wb') as f:
+        f.write(orjson.dumps(route_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
     return filepath
 
-@app.callback(
+def _report_save_error(future: Future) -> None:
+    """Log a failed background route save, which would otherwise be silently dropped."""
+    error = future.exception()
+    if error is not None:
+        print(f"Error saving route: {str(error)}")
+
+# Instrument gauges and route panels are rendered in the browser (assets/gauges.js)
+app.clientside_callback(
+    ClientsideFunction(namespace='gauges', function_name='updateSpeed'),
     Output('speed-gauge', 'figure'),
-    [Input('map', 'srcDoc')]
+    Input('route-data', 'data'),
+    prevent_initial_call=True
 )
-def update_speed_gauge(_):
-    """Update the speed gauge."""
-    return {
-        'data': [go.Indicator(
-            mode="gauge+number",
-            value=15,  # Default speed
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Speed (knots)"},
-            gauge={
-                'axis': {'range': [0, 30]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 10], 'color': "lightgreen"},
-                    {'range': [10, 20], 'color': "yellow"},
-                    {'range': [20, 30], 'color': "red"}
-                ]
-            }
-        )]
-    }
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace='gauges', function_name='updateWind'),
     Output('wind-gauge', 'figure'),
-    [Input('map', 'srcDoc')]
+    Input('route-data', 'data'),
+    prevent_initial_call=True
 )
-def update_wind_gauge(_):
-    """Update the wind gauge."""
-    return {
-        'data': [go.Indicator(
-            mode="gauge+number",
-            value=0,  # Will be updated by route calculation
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Wind Speed (m/s)"},
-            gauge={
-                'axis': {'range': [0, 40]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 10], 'color': "lightblue"},
-                    {'range': [10, 25], 'color': "yellow"},
-                    {'range': [25, 40], 'color': "red"}
-                ]
-            }
-        )]
-    }
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace='gauges', function_name='updateWave'),
     Output('wave-gauge', 'figure'),
-    [Input('map', 'srcDoc')]
+    Input('route-data', 'data'),
+    prevent_initial_call=True
 )
-def update_wave_gauge(_):
-    """Update the wave height gauge."""
-    return {
-        'data': [go.Indicator(
-            mode="gauge+number",
-            value=0,  # Will be updated by route calculation
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Wave Height (m)"},
-            gauge={
-                'axis': {'range': [0, 10]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 2], 'color': "lightblue"},
-                    {'range': [2, 5], 'color': "yellow"},
-                    {'range': [5, 10], 'color': "red"}
-                ]
-            }
-        )]
-    }
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace='gauges', function_name='updateSummary'),
     Output('weather-summary', 'children'),
-    [Input('map', 'srcDoc')]
+    Input('route-data', 'data'),
+    prevent_initial_call=True
 )
-def update_weather_summary(_):
-    """Update the weather summary."""
-    return html.Div("Weather data will appear here after calculating a route.")
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace='gauges', function_name='updateInfo'),
     Output('route-info', 'children'),
-    [Input('map', 'srcDoc')]
+    Input('route-data', 'data'),
+    prevent_initial_call=True
 )
-def update_route_info(_):
-    """Update the route information."""
-    return html.Div("Route information will appear here after calculating a route.")
 
 # Run the app
 if __name__ == '__main__':
@@ -0,0 +1,87 @@
+// Clientside callbacks for the ship instrument gauges and route panels.
+// These are built in the browser from the small route-data store so a route
+// calculation does not cost a server roundtrip per gauge.
+
+function indicatorFigure(value, title, range, steps) {
+    return {
+        'data': [{
+            'type': 'indicator',
+            'mode': 'gauge+number',
+            'value': value,
+            'domain': {'x': [0, 1], 'y': [0, 1]},
+            'title': {'text': title},
+            'gauge': {
+                'axis': {'range': range},
+                'bar': {'color': 'darkblue'},
+                'steps': steps
+            }
+        }]
+    };
+}
+
+function routeValue(routeData, key, fallback) {
+    if (routeData && routeData[key] !== undefined && routeData[key] !== null) {
+        return routeData[key];
+    }
+    return fallback;
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    gauges: {
+        updateSpeed: function(routeData) {
+            return indicatorFigure(
+                routeValue(routeData, 'speed', 15),  // Planned speed
+                'Speed (knots)',
+                [0, 30],
+                [
+                    {'range': [0, 10], 'color': 'lightgreen'},
+                    {'range': [10, 20], 'color': 'yellow'},
+                    {'range': [20, 30], 'color': 'red'}
+                ]
+            );
+        },
+
+        updateWind: function(routeData) {
+            return indicatorFigure(
+                routeValue(routeData, 'wind', 0),
+                'Wind Speed (m/s)',
+                [0, 40],
+                [
+                    {'range': [0, 10], 'color': 'lightblue'},
+                    {'range': [10, 25], 'color': 'yellow'},
+                    {'range': [25, 40], 'color': 'red'}
+                ]
+            );
+        },
+
+        updateWave: function(routeData) {
+            return indicatorFigure(
+                routeValue(routeData, 'wave', 0),
+                'Wave Height (m)',
+                [0, 10],
+                [
+                    {'range': [0, 2], 'color': 'lightblue'},
+                    {'range': [2, 5], 'color': 'yellow'},
+                    {'range': [5, 10], 'color': 'red'}
+                ]
+            );
+        },
+
+        updateSummary: function(routeData) {
+            var summary = routeValue(routeData, 'summary', null);
+            if (summary === null) {
+                return 'Weather data will appear here after calculating a route.';
+            }
+            // format_weather_summary emits Markdown
+            return {
+                'namespace': 'dash_core_components',
+                'type': 'Markdown',
+                'props': {'children': summary}
+            };
+        },
+
+        updateInfo: function(routeData) {
+            return routeValue(routeData, 'info', 'Route information will appear here after calculating a route.');
+        }
+    }
+});
@@ -1,20 +1,58 @@
-from dash import Dash, html, dcc, Input, Output, State
+from dash import Dash, html, dcc, Input, Output, State, Patch
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
+import networkx as nx
 
-from routing.graph import Port, build_graph
+from routing.graph import Port, build_graph, haversine_km
 from routing.pathfinding import fastest_path, safest_path, recommended_path
-from weather.simulation import simulate_weather
+from weather.simulation import simulate_weather_batch
+
+
+# Fixed midpoints of the route mesh; only the user's endpoints change per request
+_STATIC_PORTS = (
+    Port("A", (10.0, 15.0)),
+    Port("B", (5.0, 30.0)),
+)
+_STATIC_GRAPH = build_graph(_STATIC_PORTS)
+
+# Plain-dict gauge traces; patching ``value`` skips go.Indicator schema validation per call
+_SPEED_GAUGE = {"type": "indicator", "mode": "gauge+number", "title": {"text": "Speed (kn)"}}
+_TEMP_GAUGE = {"type": "indicator", "mode": "gauge+number", "title": {"text": "Temp (°C)"}}
+_PRESSURE_GAUGE = {"type": "indicator", "mode": "gauge+number", "title": {"text": "Pressure (hPa)"}}
+
+
+def _gauge_figure(template: dict, value: float) -> dict:
+    return {"data": [dict(template, value=value)]}
+
+
+def _gauge_patch(value: float) -> Patch:
+    # Partial update of an existing gauge: only data[0].value goes over the wire
+    patch = Patch()
+    patch["data"][0]["value"] = value
+    return patch
+
+
+def _route_graph(start: Port, end: Port) -> nx.Graph:
+    # Extend a copy of the precomputed static mesh with the two dynamic endpoints
+    graph = _STATIC_GRAPH.copy()
+    endpoints = (start, end)
+    for port in endpoints:
+        graph.add_node(port.name, coord=port.coord)
+    for i, port in enumerate(endpoints):
+        lat1, lon1 = port.coord
+        for other in _STATIC_PORTS + endpoints[i + 1 :]:
+            lat2, lon2 = other.coord
+            graph.add_edge(port.name, other.name, distance=haversine_km(lat1, lon1, lat2, lon2))
+    return graph
 
 
 def create_app() -> Dash:
     app = Dash(__name__)
 
     # Placeholder gauges
-    speed_gauge = go.Figure(go.Indicator(mode="gauge+number", value=12, title={"text": "Speed (kn)"}))
-    temp_gauge = go.Figure(go.Indicator(mode="gauge+number", value=22, title={"text": "Temp (°C)"}))
-    pressure_gauge = go.Figure(go.Indicator(mode="gauge+number", value=1013, title={"text": "Pressure (hPa)"}))
+    speed_gauge = _gauge_figure(_SPEED_GAUGE, 12)
+    temp_gauge = _gauge_figure(_TEMP_GAUGE, 22)
+    pressure_gauge = _gauge_figure(_PRESSURE_GAUGE, 1013)
 
     app.layout = html.Div(
         [
@@ -92,13 +130,7 @@ def create_app() -> Dash:
     )
     def on_compute(_, s_lat, s_lon, e_lat, e_lon, path_type):
         # Build ad-hoc graph from inputs + existing mesh
-        ports = [
-            Port("S", (float(s_lat), float(s_lon))),
-            Port("A", (10.0, 15.0)),
-            Port("B", (5.0, 30.0)),
-            Port("E", (float(e_lat), float(e_lon))),
-        ]
-        graph = build_graph(ports)
+        graph = _route_graph(Port("S", (float(s_lat), float(s_lon))), Port("E", (float(e_lat), float(e_lon))))
 
         if path_type == "fastest":
             nodes = fastest_path(graph, "S", "E")
@@ -110,19 +142,24 @@ def create_app() -> Dash:
         coords = [graph.nodes[n]["coord"] for n in nodes]
         lats, lons = zip(*coords)
 
-        fig = px.scatter_geo()
-        fig.add_scattergeo(lat=lats, lon=lons, mode="lines+markers", line=dict(width=3))
-        fig.update_layout(geo=dict(showland=True), margin=dict(l=0, r=0, t=0, b=0))
+        # Scattermapbox draws through WebGL, so dense routes stay responsive
+        fig = go.Figure(go.Scattermapbox(lat=lats, lon=lons, mode="lines+markers", line=dict(width=3)))
+        fig.update_layout(
+            mapbox=dict(style="open-street-map", center=dict(lat=sum(lats) / len(lats), lon=sum(lons) / len(lons)), zoom=2),
+            margin=dict(l=0, r=0, t=0, b=0),
+        )
 
-        # Simulate weather along path and update gauges
+        # Simulate weather at every path node in one call; the gauges and summary
+        # read the node just before the middle of the route
+        w = simulate_weather_batch(coords, t=0.0)
         mid_idx = max(0, len(coords) // 2 - 1)
-        w = simulate_weather(coords[mid_idx], t=0.0)
+        wind_ms = float(w["wind_ms"][mid_idx])
 
-        speed_fig = go.Figure(go.Indicator(mode="gauge+number", value=max(0, 20 - w.wind_ms), title={"text": "Speed (kn)"}))
-        temp_fig = go.Figure(go.Indicator(mode="gauge+number", value=w.temperature_c, title={"text": "Temp (°C)"}))
-        pressure_fig = go.Figure(go.Indicator(mode="gauge+number", value=w.pressure_hpa, title={"text": "Pressure (hPa)"}))
+        speed_fig = _gauge_patch(max(0.0, 20 - wind_ms))
+        temp_fig = _gauge_patch(float(w["temperature_c"][mid_idx]))
+        pressure_fig = _gauge_patch(float(w["pressure_hpa"][mid_idx]))
 
-        summary = f"Segments: {len(nodes)-1} | Wind: {w.wind_ms:.1f} m/s | Rain: {w.rainfall_mm_h:.1f} mm/h"
+        summary = f"Segments: {len(nodes)-1} | Wind: {wind_ms:.1f} m/s | Rain: {w['rainfall_mm_h'][mid_idx]:.1f} mm/h"
         return fig, speed_fig, temp_fig, pressure_fig, summary
 
     return app
@@ -0,0 +1,39 @@
+# cython: language_level=3
+"""
+Compiled full-mesh haversine kernel, used by routing.graph in place of the Numba
+kernel when built (avoids the JIT warm-up). Deploys build it in render.yaml's
+buildCommand; locally, build in place with:
+
+    cythonize -3 routing/_haversine.pyx
+    cc -shared -fPIC -O3 -fopenmp $(python3-config --includes) routing/_haversine.c \
+        -o routing/_haversine$(python3-config --extension-suffix)
+
+Rows are split across OpenMP threads (hence -fopenmp), like the Numba kernel's prange.
+"""
+
+cimport cython
+from cython cimport floating
+from cython.parallel cimport prange
+from libc.math cimport sin, sqrt, atan2
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef void haversine_matrix(floating[::1] lats, floating[::1] lons, floating[::1] cos_lats, double[:, ::1] out) noexcept nogil:
+    # Fills all of ``out``: each pair is computed once and mirrored, and the diagonal is zero
+    cdef double R = 6371.0
+    cdef Py_ssize_t n = lats.shape[0]
+    cdef Py_ssize_t i, j
+    cdef double dlat, dlon, x, d, cos_i
+    # Row i holds n - i - 1 pairs, so guided scheduling balances the triangle
+    for i in prange(n, schedule='guided'):
+        cos_i = cos_lats[i]
+        out[i, i] = 0.0
+        for j in range(i + 1, n):
+            dlat = lats[j] - lats[i]
+            dlon = lons[j] - lons[i]
+            x = sin(dlat / 2) ** 2 + cos_i * cos_lats[j] * sin(dlon / 2) ** 2
+            d = 2 * R * atan2(sqrt(x), sqrt(1 - x))
+            out[i, j] = d
+            out[j, i] = d
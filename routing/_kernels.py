@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from math import sin, sqrt, atan2, pi
+
+import numpy as np
+from numba import njit, prange
+
+from routing.cheap_ruler import _E2, _RE
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def edge_costs(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    cos_lat: np.ndarray,
+    sin_lat: np.ndarray,
+    risk: np.ndarray,
+    max_ruler_km: float,
+    risk_weights: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    out_dist: np.ndarray,
+    out_costs: np.ndarray,
+) -> None:
+    # Fused distance + risk cost for every edge (rows[e], cols[e]), lat/lon in radians
+    # and cos_lat/sin_lat their per-node values, so no edge calls cos or sin for them.
+    # Row k of out_costs gets d * (1 + risk_weights[k] * r), so every path type's
+    # cost comes out of the one pass that computes d.
+    # Distances are cheap_ruler.distance: the WGS84 ruler at the pair's mid-latitude,
+    # whose cosine follows from the endpoints' as sqrt((1 + cos(a + b)) / 2), falling
+    # back to haversine above max_ruler_km.
+    # Work and memory scale with the number of edges, not with N * N.
+    R = 6371.0
+    for e in prange(rows.shape[0]):
+        i = rows[e]
+        j = cols[e]
+        dlat = lat[j] - lat[i]
+        dlon = (lon[j] - lon[i] + pi) % (2 * pi) - pi
+        c2 = max(0.5 * (1 + cos_lat[i] * cos_lat[j] - sin_lat[i] * sin_lat[j]), 0.0)
+        w2 = 1 / (1 - _E2 * (1 - c2))
+        w = sqrt(w2)
+        dx = dlon * _RE * w * sqrt(c2)
+        dy = dlat * _RE * w * w2 * (1 - _E2)
+        d = sqrt(dx * dx + dy * dy)
+        if d > max_ruler_km:
+            x = sin(dlat / 2) ** 2 + cos_lat[i] * cos_lat[j] * sin(dlon / 2) ** 2
+            d = 2 * R * atan2(sqrt(x), sqrt(1 - x))
+        # Average risk along the edge
+        r = 0.5 * (risk[i] + risk[j])
+        out_dist[e] = d
+        for k in range(risk_weights.shape[0]):
+            out_costs[k, e] = d * (1 + r * risk_weights[k])
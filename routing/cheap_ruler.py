@@ -0,0 +1,47 @@
+"""
+Mapbox cheap-ruler distance approximation on the WGS84 ellipsoid.
+
+For short segments (well under 1000 km) this is more accurate than haversine and needs
+no trigonometry per pair once the per-latitude factors are known. Pairs longer than
+MAX_DISTANCE_KM fall back to the great-circle haversine distance.
+"""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from routing.graph import haversine_km_radians
+
+# WGS84 ellipsoid
+_RE = 6378.137  # Equatorial radius in km
+_FE = 1 / 298.257223563  # Flattening
+_E2 = _FE * (2 - _FE)
+_KM_PER_DEGREE = _RE * np.pi / 180
+
+# Beyond this the flat-earth approximation drifts; use haversine instead
+MAX_DISTANCE_KM = 500.0
+
+
+def ruler(lat) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the (kx, ky) km-per-degree factors for longitude and latitude at the given latitude(s)."""
+    coslat = np.cos(np.radians(np.asarray(lat, dtype=np.float64)))
+    w2 = 1 / (1 - _E2 * (1 - coslat * coslat))
+    w = np.sqrt(w2)
+    kx = _KM_PER_DEGREE * w * coslat
+    ky = _KM_PER_DEGREE * w * w2 * (1 - _E2)
+    return kx, ky
+
+
+def distance(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Distance in km between degree coordinates; broadcasts like any NumPy ufunc."""
+    lat1, lon1, lat2, lon2 = (np.asarray(v, dtype=np.float64) for v in (lat1, lon1, lat2, lon2))
+    kx, ky = ruler((lat1 + lat2) / 2)
+    dlon = (lon1 - lon2 + 180) % 360 - 180  # Shortest way round the antimeridian
+    dist = np.asarray(np.hypot(dlon * kx, (lat1 - lat2) * ky))
+    far = dist > MAX_DISTANCE_KM
+    if np.any(far):
+        # Only the long pairs are converted to radians and run through haversine
+        lat1, lon1, lat2, lon2 = (np.radians(v[far]) for v in np.broadcast_arrays(lat1, lon1, lat2, lon2))
+        dist[far] = haversine_km_radians(lat1, lon1, lat2, lon2)
+    return dist
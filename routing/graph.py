@@ -1,9 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Tuple, Iterable
+from math import radians, sin, cos, sqrt, atan2
+from typing import Dict, Sequence, Tuple, Iterable
 
 import networkx as nx
+import numpy as np
+from numba import njit, prange
+
+try:
+    from routing._haversine import haversine_matrix as _compiled_haversine_matrix
+except ImportError:  # extension not built; fall back to the Numba kernel
+    _compiled_haversine_matrix = None
 
 
 Coordinate = Tuple[float, float]
@@ -15,23 +23,79 @@ class Port:
     coord: Coordinate
 
 
+@dataclass(frozen=True, eq=False)
+class MeshArrays:
+    """Array (SoA) view of the port mesh, indexed by integer node id."""
+
+    node_idx: Dict[str, int]
+    coords: np.ndarray  # (N, 2) float32 lat/lon in degrees
+    indptr: np.ndarray  # CSR row pointers, (N + 1,)
+    indices: np.ndarray  # CSR column ids
+    weights: np.ndarray  # CSR edge distances in km
+
+
 def build_graph(ports: Iterable[Port]) -> nx.Graph:
+    # Materialize once: ``ports`` may be a one-shot iterator and is traversed twice
+    ports = tuple(ports)
     graph = nx.Graph()
     for port in ports:
         graph.add_node(port.name, coord=port.coord)
+    if len(ports) < 2:
+        return graph
     # Simple full mesh as placeholder; real logic would restrict to sea lanes
-    names = [p.name for p in ports]
-    for i, a in enumerate(names):
-        for b in names[i + 1 :]:
-            graph.add_edge(a, b, distance=haversine_km(graph.nodes[a]["coord"], graph.nodes[b]["coord"]))
+    # Edges from the exact float64 coords, so they agree with haversine on the node coords
+    distances = _mesh_distances(_port_coords(ports))
+    n = len(ports)
+    for i in range(n):
+        a = ports[i].name
+        row = distances[i].tolist()
+        for j in range(i + 1, n):
+            graph.add_edge(a, ports[j].name, distance=row[j])
     return graph
 
 
-def haversine_km(a: Coordinate, b: Coordinate) -> float:
-    from math import radians, sin, cos, sqrt, atan2
+def build_mesh_arrays(ports: Iterable[Port]) -> MeshArrays:
+    """Build the same full mesh as ``build_graph`` as contiguous CSR arrays for array-based pathfinding."""
+    ports = tuple(ports)
+    n = len(ports)
+    # Weights from the float64 coords, exactly as in build_graph
+    coords = _port_coords(ports)
+    distances = _mesh_distances(coords)
+    off_diagonal = ~np.eye(n, dtype=bool)
+    return MeshArrays(
+        node_idx={p.name: i for i, p in enumerate(ports)},
+        # float32 storage rounds each degree value by at most ~1.7 m and halves memory traffic
+        coords=coords.astype(np.float32),
+        indptr=np.arange(n + 1, dtype=np.int64) * max(n - 1, 0),
+        indices=np.nonzero(off_diagonal)[1].astype(np.int64),
+        weights=distances[off_diagonal],
+    )
+
+
+def _port_coords(ports: Sequence[Port]) -> np.ndarray:
+    # Distance math is always done in float64 (see _mesh_distances)
+    return np.array([p.coord for p in ports], dtype=np.float64).reshape(len(ports), 2)
 
-    lat1, lon1 = a
-    lat2, lon2 = b
+
+def _mesh_distances(coords: np.ndarray) -> np.ndarray:
+    # Symmetric (N, N) haversine matrix with a zero diagonal. Upcast first: float32
+    # trig in the kernels loses up to ~150 m, and both backends then compute in double
+    n = coords.shape[0]
+    rad = np.radians(coords.astype(np.float64))
+    lats = np.ascontiguousarray(rad[:, 0])
+    lons = np.ascontiguousarray(rad[:, 1])
+    # One cos per node instead of two per pair inside the kernels
+    cos_lats = np.cos(lats)
+    distances = np.empty((n, n))
+    if _compiled_haversine_matrix is not None:
+        _compiled_haversine_matrix(lats, lons, cos_lats, distances)
+    else:
+        _haversine_matrix(lats, lons, cos_lats, distances)
+    return distances
+
+
+@njit("float64(float64, float64, float64, float64)", cache=True, fastmath=True)
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     R = 6371.0
     dlat = radians(lat2 - lat1)
     dlon = radians(lon2 - lon1)
@@ -39,3 +103,24 @@ def haversine_km(a: Coordinate, b: Coordinate) -> float:
     return 2 * R * atan2(sqrt(x), sqrt(1 - x))
 
 
+def haversine_km_radians(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in km between coordinates in radians; broadcasts like any NumPy ufunc."""
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371.0 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _haversine_matrix(lats_rad: np.ndarray, lons_rad: np.ndarray, cos_lats: np.ndarray, out: np.ndarray) -> None:
+    # Fills all of ``out``: each pair is computed once and mirrored, and the diagonal is zero
+    R = 6371.0
+    n = lats_rad.shape[0]
+    for i in prange(n):
+        cos_i = cos_lats[i]
+        out[i, i] = 0.0
+        for j in range(i + 1, n):
+            dlat = lats_rad[j] - lats_rad[i]
+            dlon = lons_rad[j] - lons_rad[i]
+            x = sin(dlat / 2) ** 2 + cos_i * cos_lats[j] * sin(dlon / 2) ** 2
+            d = 2 * R * atan2(sqrt(x), sqrt(1 - x))
+            out[i, j] = d
+            out[j, i] = d
@@ -1,12 +1,43 @@
 import networkx as nx
 import numpy as np
 from typing import List, Tuple, Dict, Optional
-from geopy.distance import geodesic
+import shapely
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, dijkstra
+from shapely.strtree import STRtree
+from sklearn.neighbors import BallTree
+
+from routing import cheap_ruler
+from routing._kernels import edge_costs
+
+# Risk penalty per path type: edge cost = distance * (1 + weight * average risk)
+PATH_RISK_WEIGHTS = {
+    'fastest': 0.0,
+    'safest': 5.0,  # Heavily penalize risk
+    'recommended': 1.0  # Balance between speed and safety
+}
+
+# Below this many points the full mesh is cheap; above it each point only
+# links to its nearest neighbours
+FULL_MESH_MAX_POINTS = 50
+NEAREST_NEIGHBORS = 8
 
 class MaritimePathFinder:
     def __init__(self):
-        self.graph = nx.Graph()
+        # Route state lives in arrays: per node (coords, risks) and per edge
+        # (distances, costs by path type, aligned with _edges); the NetworkX view is built on demand
+        self._coords = np.empty((0, 2))
+        self._risks = np.empty(0)
+        self._edges: Tuple[np.ndarray, np.ndarray] = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+        self._distances = np.empty(0)
+        self._costs: Dict[str, np.ndarray] = {}
+        self._graph: Optional[nx.Graph] = None
         self.risk_zones = self._initialize_risk_zones()
+        # Zone fields as arrays so risk can be broadcast over many points at once
+        self._zone_coords = np.array([zone['coordinates'] for zone in self.risk_zones], dtype=np.float64).reshape(-1, 2)
+        self._zone_radius = np.array([zone['radius'] for zone in self.risk_zones], dtype=np.float64)
+        self._zone_level = np.array([zone['risk_level'] for zone in self.risk_zones], dtype=np.float64)
+        self._zone_tree = self._build_zone_index()
         
     def _initialize_risk_zones(self) -> List[dict]:
         """Initialize predefined risk zones (can be extended with real data)."""
@@ -16,50 +47,218 @@ class MaritimePathFinder:
             {'coordinates': (30, -60), 'radius': 400, 'risk_level': 0.7}   # Another risk zone
         ]
     
+    def _build_zone_index(self) -> STRtree:
+        """Index each zone by the lat/lon bounding box of its radius so queries skip distant zones.
+        
+        Boxes must hold every point cheap_ruler.distance puts inside the radius: the
+        WGS84 ruler below MAX_DISTANCE_KM and the 6371 km sphere above it, so each
+        half-width is the larger of the two.
+        """
+        angular = self._zone_radius / 6371.0  # Zone radius as an angle in radians
+        lat = self._zone_coords[:, 0]
+        lon = self._zone_coords[:, 1]
+        # Ruler ky grows towards the poles, so the equatorial value bounds every latitude step
+        _, ky_min = cheap_ruler.ruler(0.0)
+        dlat = np.maximum(np.degrees(angular), self._zone_radius / ky_min)
+        # Widest longitude span of a spherical cap; caps reaching a pole span every longitude
+        ratio = np.sin(angular) / np.maximum(np.cos(np.radians(lat)), 1e-12)
+        sphere_dlon = np.where(ratio < 1, np.degrees(np.arcsin(np.minimum(ratio, 1.0))), 180.0)
+        # The ruler scales longitude by kx at the pair's mid-latitude, which lies within
+        # half the latitude span of the centre; kx shrinks towards the poles
+        kx_min, _ = cheap_ruler.ruler(np.minimum(np.abs(lat) + dlat / 2, 90.0))
+        ruler_dlon = np.where(kx_min > 0, self._zone_radius / np.maximum(kx_min, 1e-12), 180.0)
+        dlon = np.minimum(np.maximum(sphere_dlon, ruler_dlon), 180.0)
+        
+        # Boxes crossing the antimeridian get a second, wrapped copy; _zone_box_owner maps boxes to zones
+        boxes, owners = [], []
+        for z in range(len(lat)):
+            south, north = max(lat[z] - dlat[z], -90.0), min(lat[z] + dlat[z], 90.0)
+            if dlon[z] >= 180.0:
+                spans = [(-180.0, 180.0)]
+            else:
+                west, east = lon[z] - dlon[z], lon[z] + dlon[z]
+                spans = [(max(west, -180.0), min(east, 180.0))]
+                if west < -180.0:
+                    spans.append((west + 360.0, 180.0))
+                if east > 180.0:
+                    spans.append((-180.0, east - 360.0))
+            for west, east in spans:
+                boxes.append(shapely.box(west, south, east, north))
+                owners.append(z)
+        self._zone_box_owner = np.array(owners, dtype=np.intp)
+        return STRtree(boxes)
+    
     def calculate_risk(self, point: Tuple[float, float]) -> float:
         """Calculate risk level for a given point based on proximity to risk zones."""
-        total_risk = 0.0
-        for zone in self.risk_zones:
-            distance = geodesic(point, zone['coordinates']).kilometers
-            if distance < zone['radius']:
-                # Inverse square law for risk attenuation
-                risk = zone['risk_level'] * (1 - (distance / zone['radius']) ** 2)
-                total_risk = max(total_risk, risk)
-        return min(total_risk, 1.0)
+        return float(self.calculate_risk_batch(np.asarray([point], dtype=np.float64))[0])
+    
+    def calculate_risk_batch(self, points: np.ndarray) -> np.ndarray:
+        """Calculate risk levels for an (N, 2) array of (lat, lon) points in one vectorized pass."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        risk = np.zeros(len(points))
+        if len(self._zone_level) == 0:
+            return risk
+        
+        # Only (point, zone) pairs whose zone bounding box contains the point
+        point_idx, box_idx = self._zone_tree.query(
+            shapely.points(points[:, 1], points[:, 0]), predicate='intersects'
+        )
+        if len(point_idx) == 0:
+            return risk
+        zone_idx = self._zone_box_owner[box_idx]
+        
+        distances = cheap_ruler.distance(
+            points[point_idx, 0], points[point_idx, 1],
+            self._zone_coords[zone_idx, 0], self._zone_coords[zone_idx, 1]
+        )
+        # Inverse square law for risk attenuation, zero outside each zone's radius
+        zone_risk = self._zone_level[zone_idx] * np.clip(1 - (distances / self._zone_radius[zone_idx]) ** 2, 0, None)
+        np.maximum.at(risk, point_idx, zone_risk)
+        return risk.clip(max=1.0)
+    
+    def _build_edge_costs(self,
+                          points: List[Tuple[float, float]],
+                          path_types: Tuple[str, ...] = tuple(PATH_RISK_WEIGHTS)) -> None:
+        """Compute node risks, the route network's edges and per-edge distances and costs."""
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self._coords = coords
+        self._risks = self.calculate_risk_batch(coords)
+        self._set_edges(self._edge_pairs(coords), path_types)
+    
+    def _set_edges(self, edges: Tuple[np.ndarray, np.ndarray], path_types: Tuple[str, ...]) -> None:
+        self._edges = edges
+        self._distances, self._costs = self._edge_costs(edges, path_types)
+        self._graph = None  # Any previous view no longer matches the arrays
+    
+    def _edge_costs(self,
+                    edges: Tuple[np.ndarray, np.ndarray],
+                    path_types: Tuple[str, ...]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Distances and combined scores (lower is better) for node pairs of the current points."""
+        rows, cols = (np.ascontiguousarray(e, dtype=np.intp) for e in edges)
+        lat = np.ascontiguousarray(np.radians(self._coords[:, 0]))
+        lon = np.ascontiguousarray(np.radians(self._coords[:, 1]))
+        # Once per node; the kernel derives each edge's mid-latitude ruler from them
+        cos_lat, sin_lat = np.cos(lat), np.sin(lat)
+        
+        # One fused pass for every path type; zero risk weight means cost == distance,
+        # so those types share the distance array instead of getting a row of their own
+        weighted = [t for t in path_types if PATH_RISK_WEIGHTS[t] != 0]
+        risk_weights = np.array([PATH_RISK_WEIGHTS[t] for t in weighted], dtype=np.float64)
+        distances = np.empty(len(rows))
+        weighted_costs = np.empty((len(weighted), len(rows)))
+        edge_costs(
+            lat, lon, cos_lat, sin_lat, self._risks, cheap_ruler.MAX_DISTANCE_KM,
+            risk_weights, rows, cols, distances, weighted_costs
+        )
+        costs = {t: weighted_costs[weighted.index(t)] if t in weighted else distances for t in path_types}
+        return distances, costs
+    
+    def create_route_network(self,
+                             points: List[Tuple[float, float]],
+                             path_type: Optional[str] = None) -> nx.Graph:
+        """Create a network graph from the given points.
+        
+        With a path_type only that weight is attached to the edges; otherwise
+        all of 'fastest', 'safest' and 'recommended' are.
+        """
+        path_types = tuple(PATH_RISK_WEIGHTS) if path_type is None else (path_type,)
+        self._build_edge_costs(points, path_types)
+        return self.graph
+    
+    @property
+    def graph(self) -> nx.Graph:
+        """NetworkX view of the last route network, built from the arrays on first access."""
+        if self._graph is None:
+            self._graph = self._graph_from_arrays()
+        return self._graph
     
-    def create_route_network(self, points: List[Tuple[float, float]]) -> nx.Graph:
-        """Create a network graph from the given points."""
-        self.graph.clear()
+    def _graph_from_arrays(self) -> nx.Graph:
+        graph = nx.Graph()
+        risks = self._risks.tolist()
         
         # Add nodes with position and risk data
-        for i, (lat, lon) in enumerate(points):
-            risk = self.calculate_risk((lat, lon))
-            self.graph.add_node(i, pos=(lon, lat), risk=risk, lat=lat, lon=lon)
+        for i, (lat, lon) in enumerate(self._coords.tolist()):
+            graph.add_node(i, pos=(lon, lat), risk=risks[i], lat=lat, lon=lon)
         
         # Add edges with weights based on distance and risk
-        for i in range(len(points)):
-            for j in range(i + 1, len(points)):
-                pos_i = self.graph.nodes[i]['pos']
-                pos_j = self.graph.nodes[j]['pos']
-                
-                # Calculate great circle distance in km
-                distance = geodesic(points[i], points[j]).kilometers
-                
-                # Calculate average risk along the edge
-                risk = (self.graph.nodes[i]['risk'] + self.graph.nodes[j]['risk']) / 2
-                
-                # Add edge with multiple weights
-                self.graph.add_edge(
-                    i, j,
-                    distance=distance,
-                    risk=risk,
-                    # Combined score (lower is better)
-                    fastest=distance,
-                    safest=distance * (1 + risk * 5),  # Heavily penalize risk
-                    recommended=distance * (1 + risk)   # Balance between speed and safety
-                )
+        distances = self._distances.tolist()
+        costs = {name: cost.tolist() for name, cost in self._costs.items()}
+        rows, cols = self._edges
+        for e, (i, j) in enumerate(zip(rows.tolist(), cols.tolist())):
+            graph.add_edge(
+                i, j,
+                distance=distances[e],
+                risk=0.5 * (risks[i] + risks[j]),  # Average risk along the edge
+                **{name: cost[e] for name, cost in costs.items()}
+            )
         
-        return self.graph
+        return graph
+    
+    @staticmethod
+    def _edge_pairs(points: List[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (i, j) node ids with i < j for every edge of the route network."""
+        n = len(points)
+        if n < FULL_MESH_MAX_POINTS:
+            return np.triu_indices(n, 1)
+        
+        # Link each point to its k nearest neighbours by great-circle distance
+        rad = np.radians(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+        neighbors = BallTree(rad, metric='haversine').query(rad, k=NEAREST_NEIGHBORS + 1, return_distance=False)
+        rows = np.repeat(np.arange(n), neighbors.shape[1])
+        cols = neighbors.ravel()
+        keep = rows != cols
+        # Neighbourhoods are not symmetric; keep each undirected edge once
+        pairs = np.unique(np.minimum(rows, cols)[keep] * n + np.maximum(rows, cols)[keep])
+        return MaritimePathFinder._connect_components(rad, pairs // n, pairs % n)
+    
+    @staticmethod
+    def _connect_components(rad: np.ndarray,
+                            rows: np.ndarray,
+                            cols: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Link clusters the neighbour graph leaves apart through their nearest cross-cluster pairs.
+        
+        Each round joins every component but the largest to its closest outside point,
+        so the count at least halves and the edge list only grows by one edge per component.
+        """
+        n = len(rad)
+        while True:
+            adjacency = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+            count, labels = connected_components(adjacency, directed=False)
+            if count == 1:
+                return rows, cols
+            largest = np.bincount(labels).argmax()
+            links = set()
+            for component in range(count):
+                if component == largest:
+                    continue
+                inside = np.flatnonzero(labels == component)
+                outside = np.flatnonzero(labels != component)
+                distance, nearest = BallTree(rad[outside], metric='haversine').query(rad[inside], k=1)
+                closest = distance[:, 0].argmin()
+                i, j = inside[closest], outside[nearest[closest, 0]]
+                links.add((min(i, j), max(i, j)))
+            extra = np.array(sorted(links), dtype=np.intp)
+            rows = np.concatenate([rows, extra[:, 0]])
+            cols = np.concatenate([cols, extra[:, 1]])
+    
+    @staticmethod
+    def _shortest_path(n: int,
+                       edges: Tuple[np.ndarray, np.ndarray],
+                       cost: np.ndarray,
+                       source: int,
+                       target: int) -> List[int]:
+        """Run SciPy's C Dijkstra over the undirected edge list and walk the predecessors back."""
+        # Explicit entries are edges, zero-length ones between coincident points included
+        graph = csr_matrix((cost, edges), shape=(n, n))
+        _, predecessors = dijkstra(graph, directed=False, indices=source, return_predecessors=True)
+        
+        node_path = [target]
+        while node_path[-1] != source:
+            previous = predecessors[node_path[-1]]
+            if previous < 0:
+                raise ValueError("No valid path found between the specified points")
+            node_path.append(int(previous))
+        return node_path[::-1]
     
     def find_path(self, 
                  start: Tuple[float, float], 
@@ -84,44 +283,28 @@ class MaritimePathFinder:
         # Combine all points (start, waypoints, end)
         all_points = [start] + waypoints + [end]
         
-        # Create network and find path
-        self.create_route_network(all_points)
+        # Only the selected metric's costs are computed
+        cost_type = path_type if path_type in PATH_RISK_WEIGHTS else 'recommended'
+        self._build_edge_costs(all_points, (cost_type,))
         
         # Find shortest path based on selected metric
-        weight_map = {
-            'fastest': 'fastest',
-            'safest': 'safest',
-            'recommended': 'recommended'
-        }
+        n = len(all_points)
+        node_path = self._shortest_path(n, self._edges, self._costs[cost_type], 0, n - 1)
         
-        try:
-            node_path = nx.shortest_path(
-                self.graph, 
-                source=0,  # Start node
-                target=len(all_points) - 1,  # End node
-                weight=weight_map.get(path_type, 'recommended')
-            )
-            
-            # Extract path coordinates and calculate statistics
-            path_coords = [all_points[i] for i in node_path]
-            total_distance = sum(
-                self.graph.edges[node_path[i], node_path[i+1]]['distance']
-                for i in range(len(node_path) - 1)
-            )
-            
-            total_risk = sum(
-                self.graph.edges[node_path[i], node_path[i+1]]['risk']
-                for i in range(len(node_path) - 1)
-            ) / max(1, len(node_path) - 1)
-            
-            return {
-                'path': path_coords,
-                'distance_km': total_distance,
-                'average_risk': total_risk,
-                'waypoints': waypoints,
-                'path_type': path_type,
-                'node_path': node_path
-            }
-            
-        except nx.NetworkXNoPath:
-            raise ValueError("No valid path found between the specified points")
+        # Extract path coordinates and calculate statistics
+        path_coords = [all_points[i] for i in node_path]
+        path_arr = np.asarray(node_path)
+        leg_distances, _ = self._edge_costs((path_arr[:-1], path_arr[1:]), ())
+        total_distance = float(leg_distances.sum())
+        
+        edge_risks = 0.5 * (self._risks[path_arr[:-1]] + self._risks[path_arr[1:]])
+        total_risk = float(edge_risks.mean()) if len(edge_risks) else 0.0
+        
+        return {
+            'path': path_coords,
+            'distance_km': total_distance,
+            'average_risk': total_risk,
+            'waypoints': waypoints,
+            'path_type': path_type,
+            'node_path': node_path
+        }
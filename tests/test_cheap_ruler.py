@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from routing import cheap_ruler
+from routing.graph import haversine_km
+
+
+def test_cheap_ruler_is_close_to_haversine_for_short_hops():
+    rng = np.random.default_rng(1)
+    lat = rng.uniform(-70, 70, 1000)
+    lon = rng.uniform(-180, 180, 1000)
+    lat2, lon2 = lat + rng.uniform(-1, 1, 1000), lon + rng.uniform(-1, 1, 1000)
+    ruler = cheap_ruler.distance(lat, lon, lat2, lon2)
+    sphere = np.array([haversine_km(*p) for p in zip(lat, lon, lat2, lon2)])
+    # The ellipsoid and the 6371 km sphere differ by well under 1% at these scales
+    np.testing.assert_allclose(ruler, sphere, rtol=1e-2)
+
+
+def test_cheap_ruler_falls_back_to_haversine_for_long_pairs():
+    lat1, lon1 = np.array([0.0, 10.0, -40.0]), np.array([0.0, 20.0, 100.0])
+    lat2, lon2 = np.array([50.0, 10.0, 35.0]), np.array([50.0, 60.0, -120.0])
+    expected = [haversine_km(*p) for p in zip(lat1, lon1, lat2, lon2)]
+    np.testing.assert_allclose(cheap_ruler.distance(lat1, lon1, lat2, lon2), expected, rtol=1e-12)
+
+
+def test_cheap_ruler_wraps_the_antimeridian():
+    across = cheap_ruler.distance(0.0, 179.9, 0.0, -179.9)
+    assert across == pytest.approx(cheap_ruler.distance(0.0, -0.1, 0.0, 0.1))
+    assert across < 25.0
@@ -0,0 +1,59 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from routing import graph as graph_module
+from routing.graph import Port, build_graph, build_mesh_arrays, haversine_km
+
+
+def _random_ports(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    coords = np.column_stack([rng.uniform(-80, 80, n), rng.uniform(-180, 180, n)])
+    return [Port(f"P{i}", (float(lat), float(lon))) for i, (lat, lon) in enumerate(coords)]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 25])
+def test_mesh_arrays_match_graph_adjacency(n):
+    ports = _random_ports(n, seed=n)
+    mesh = build_mesh_arrays(ports)
+    assert mesh.node_idx == {p.name: i for i, p in enumerate(ports)}
+    assert mesh.indptr.shape == (n + 1,)
+
+    dense = np.zeros((n, n))
+    for i in range(n):
+        row = slice(mesh.indptr[i], mesh.indptr[i + 1])
+        dense[i, mesh.indices[row]] = mesh.weights[row]
+    expected = nx.to_numpy_array(build_graph(ports), nodelist=[p.name for p in ports], weight="distance")
+    np.testing.assert_array_equal(dense, expected)
+    assert mesh.coords.dtype == np.float32
+
+
+def test_build_graph_edges_match_scalar_haversine():
+    ports = _random_ports(40)
+    graph = build_graph(ports)
+    assert graph.number_of_edges() == 40 * 39 // 2
+    for u, v, distance in graph.edges(data="distance"):
+        (lat1, lon1), (lat2, lon2) = graph.nodes[u]["coord"], graph.nodes[v]["coord"]
+        assert distance == pytest.approx(haversine_km(lat1, lon1, lat2, lon2), abs=1e-6)
+
+
+def test_build_graph_accepts_a_one_shot_iterator():
+    ports = _random_ports(6, seed=3)
+    from_iterator = build_graph(p for p in ports)
+    from_list = build_graph(ports)
+    assert list(from_iterator.nodes(data=True)) == list(from_list.nodes(data=True))
+    assert list(from_iterator.edges(data=True)) == list(from_list.edges(data=True))
+
+
+@pytest.mark.parametrize("kernel", [
+    graph_module._haversine_matrix,
+    pytest.param(graph_module._compiled_haversine_matrix, marks=pytest.mark.skipif(
+        graph_module._compiled_haversine_matrix is None, reason="Cython extension not built")),
+])
+def test_haversine_kernels_fill_the_whole_matrix(kernel):
+    rad = np.radians(np.array([p.coord for p in _random_ports(30, seed=4)]))
+    lats, lons = np.ascontiguousarray(rad[:, 0]), np.ascontiguousarray(rad[:, 1])
+    out = np.full((30, 30), np.nan)
+    kernel(lats, lons, np.cos(lats), out)
+    np.testing.assert_array_equal(out, out.T)
+    np.testing.assert_array_equal(np.diag(out), 0.0)
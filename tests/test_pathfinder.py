@@ -0,0 +1,146 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from routing import cheap_ruler
+from routing.pathfinder import FULL_MESH_MAX_POINTS, NEAREST_NEIGHBORS, MaritimePathFinder
+
+
+def _brute_force_risk(finder: MaritimePathFinder, points: np.ndarray) -> np.ndarray:
+    # Score every point against every zone, without the STRtree prefilter
+    distances = cheap_ruler.distance(
+        points[:, None, 0], points[:, None, 1],
+        finder._zone_coords[None, :, 0], finder._zone_coords[None, :, 1]
+    )
+    zone_risk = finder._zone_level * np.clip(1 - (distances / finder._zone_radius) ** 2, 0, None)
+    return zone_risk.max(axis=1).clip(max=1.0)
+
+
+def _set_zones(finder: MaritimePathFinder, zones) -> None:
+    finder.risk_zones = zones
+    finder._zone_coords = np.array([z['coordinates'] for z in zones], dtype=np.float64)
+    finder._zone_radius = np.array([z['radius'] for z in zones], dtype=np.float64)
+    finder._zone_level = np.array([z['risk_level'] for z in zones], dtype=np.float64)
+    finder._zone_tree = finder._build_zone_index()
+
+
+def _points_near_zones(finder: MaritimePathFinder, rng, n: int, spread: float) -> np.ndarray:
+    centres = finder._zone_coords[rng.integers(0, len(finder._zone_coords), n)]
+    points = centres + rng.normal(0, spread, (n, 2))
+    points[:, 0] = points[:, 0].clip(-90, 90)
+    points[:, 1] = (points[:, 1] + 180) % 360 - 180
+    return points
+
+
+def test_zone_index_matches_brute_force_for_default_zones():
+    finder = MaritimePathFinder()
+    points = _points_near_zones(finder, np.random.default_rng(0), 200_000, spread=5.0)
+    np.testing.assert_array_equal(finder.calculate_risk_batch(points), _brute_force_risk(finder, points))
+
+
+def test_zone_index_matches_brute_force_near_poles_and_antimeridian():
+    finder = MaritimePathFinder()
+    _set_zones(finder, [
+        {'coordinates': (85, 170), 'radius': 800, 'risk_level': 0.9},   # Reaches the pole
+        {'coordinates': (-60, -179), 'radius': 450, 'risk_level': 0.5},  # Crosses the antimeridian
+        {'coordinates': (0, 179.8), 'radius': 300, 'risk_level': 0.7},
+        {'coordinates': (70, 0), 'radius': 1500, 'risk_level': 0.4},    # Past the ruler's range
+    ])
+    rng = np.random.default_rng(1)
+    points = np.vstack([
+        _points_near_zones(finder, rng, 100_000, spread=8.0),
+        np.column_stack([rng.uniform(-90, 90, 100_000), rng.uniform(-180, 180, 100_000)]),
+    ])
+    np.testing.assert_array_equal(finder.calculate_risk_batch(points), _brute_force_risk(finder, points))
+
+
+def test_calculate_risk_matches_batch():
+    finder = MaritimePathFinder()
+    point = (19.0, -39.0)
+    assert finder.calculate_risk(point) == pytest.approx(finder.calculate_risk_batch(np.array([point]))[0])
+
+
+def _random_points(rng, n: int):
+    # Start inside the (20, -40) risk zone with waypoints scattered around it,
+    # so risk-weighted paths detour instead of taking the direct edge
+    points = [tuple(p) for p in np.column_stack([rng.uniform(-60, 60, n), rng.uniform(-180, 180, n)]).tolist()]
+    points[0] = (20.0, -40.0)
+    points[1:-1] = [(lat / 6 + 20, lon / 18 - 40) for lat, lon in points[1:-1]]
+    return points
+
+
+def _baseline_route(finder: MaritimePathFinder, points, path_type: str):
+    # The original find_path: NetworkX Dijkstra over the full attribute graph
+    graph = finder.create_route_network(points)
+    node_path = nx.shortest_path(graph, source=0, target=len(points) - 1, weight=path_type)
+    edges = list(zip(node_path, node_path[1:]))
+    distance = sum(graph.edges[e]['distance'] for e in edges)
+    risk = sum(graph.edges[e]['risk'] for e in edges) / max(1, len(edges))
+    return node_path, distance, risk
+
+
+@pytest.mark.parametrize("path_type", ['fastest', 'safest', 'recommended'])
+def test_find_path_matches_networkx_on_full_mesh(path_type):
+    rng = np.random.default_rng(3)
+    finder = MaritimePathFinder()
+    for n in (2, 3, 10, 30, FULL_MESH_MAX_POINTS - 1):
+        points = _random_points(rng, n)
+        expected_path, expected_distance, expected_risk = _baseline_route(finder, points, path_type)
+        route = finder.find_path(points[0], points[-1], points[1:-1], path_type)
+        assert route['node_path'] == expected_path
+        assert route['distance_km'] == pytest.approx(expected_distance)
+        assert route['average_risk'] == pytest.approx(expected_risk)
+
+
+def test_find_path_unknown_type_uses_recommended():
+    points = _random_points(np.random.default_rng(4), 12)
+    finder = MaritimePathFinder()
+    route = finder.find_path(points[0], points[-1], points[1:-1], 'scenic')
+    assert route['path_type'] == 'scenic'
+    assert route['node_path'] == _baseline_route(finder, points, 'recommended')[0]
+
+
+def test_find_path_searches_the_neighbour_graph_for_large_inputs():
+    points = _random_points(np.random.default_rng(5), 200)
+    finder = MaritimePathFinder()
+    route = finder.find_path(points[0], points[-1], points[1:-1], 'safest')
+    graph = finder.graph
+    assert graph.number_of_edges() < 200 * NEAREST_NEIGHBORS
+    assert route['node_path'] == nx.shortest_path(graph, 0, 199, weight='safest')
+
+
+def test_find_path_links_disconnected_neighbour_clusters():
+    rng = np.random.default_rng(6)
+    # Two clusters far apart: no nearest-neighbour edge links them
+    points = [tuple(p) for p in np.vstack([rng.random((30, 2)), rng.random((30, 2)) + 50]).tolist()]
+    finder = MaritimePathFinder()
+    route = finder.find_path(points[0], points[-1], points[1:-1], 'fastest')
+    assert route['node_path'][0] == 0 and route['node_path'][-1] == len(points) - 1
+    assert finder.graph.number_of_edges() < len(points) * NEAREST_NEIGHBORS
+
+
+def test_find_path_links_many_clusters_without_a_full_mesh():
+    rng = np.random.default_rng(7)
+    # 20 far-apart clusters of 500 points; a full mesh would need ~50M edges
+    centres = np.column_stack([np.linspace(-60, 60, 20), np.linspace(-170, 170, 20)])
+    points = np.repeat(centres, 500, axis=0) + rng.normal(0, 0.2, (10_000, 2))
+    points = [tuple(p) for p in rng.permutation(points).tolist()]
+    finder = MaritimePathFinder()
+    route = finder.find_path(points[0], points[-1], points[1:-1], 'recommended')
+    graph = finder.graph
+    assert nx.is_connected(graph)
+    assert graph.number_of_edges() < len(points) * NEAREST_NEIGHBORS
+    assert route['node_path'] == nx.shortest_path(graph, 0, len(points) - 1, weight='recommended')
+
+
+@pytest.mark.parametrize("n", [10, 200])
+def test_find_path_distance_matches_cheap_ruler_legs(n):
+    # Legs mix short ruler pairs, long haversine ones and antimeridian crossings
+    points = _random_points(np.random.default_rng(8), n)
+    points[-1] = (-35.0, 179.5)
+    finder = MaritimePathFinder()
+    for path_type in ('fastest', 'safest', 'recommended'):
+        route = finder.find_path(points[0], points[-1], points[1:-1], path_type)
+        (lat1, lon1), (lat2, lon2) = np.array(route['path'][:-1]).T, np.array(route['path'][1:]).T
+        legs = cheap_ruler.distance(lat1, lon1, lat2, lon2)
+        assert route['distance_km'] == pytest.approx(float(legs.sum()), rel=1e-9)
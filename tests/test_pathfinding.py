@@ -0,0 +1,51 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from routing.graph import Port, build_graph
+from routing.pathfinding import fastest_path, recommended_path, safest_path
+
+
+def _ports(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    coords = np.column_stack([rng.uniform(-60, 60, n), rng.uniform(-180, 180, n)]).tolist()
+    return [Port(f"P{i}", tuple(c)) for i, c in enumerate(coords)]
+
+
+def _risk(u, v, data):
+    # Deterministic, symmetric and non-negative
+    return (int(u[1:]) * int(v[1:])) % 7 / 7
+
+
+def _cost(graph, path, weight):
+    return sum(weight(u, v, graph.edges[u, v]) for u, v in zip(path, path[1:]))
+
+
+def test_astar_paths_match_dijkstra():
+    graph = build_graph(_ports(40))
+    assert fastest_path(graph, "P0", "P39") == nx.dijkstra_path(graph, "P0", "P39", weight="distance")
+    for path_func, weight in [
+        (lambda: safest_path(graph, "P0", "P39", _risk),
+         lambda u, v, d: d["distance"] * (1.0 + _risk(u, v, d))),
+        (lambda: recommended_path(graph, "P0", "P39", _risk, alpha=0.25),
+         lambda u, v, d: 0.25 * d["distance"] + 0.75 * d["distance"] * (1.0 + _risk(u, v, d))),
+    ]:
+        expected = nx.dijkstra_path(graph, "P0", "P39", weight=weight)
+        assert _cost(graph, path_func(), weight) == pytest.approx(_cost(graph, expected, weight))
+
+
+def test_edges_without_distance_stay_exact():
+    # Two hops through a far detour beat three hops along the straight line,
+    # which a great-circle heuristic on unit-cost edges would wrongly prefer
+    graph = nx.Graph()
+    for name, coord in [("A", (0.0, 0.0)), ("B", (50.0, 5.0)), ("D", (0.0, 3.0)), ("E", (0.0, 7.0)), ("C", (0.0, 10.0))]:
+        graph.add_node(name, coord=coord)
+    graph.add_edges_from([("A", "B"), ("B", "C"), ("A", "D"), ("D", "E"), ("E", "C")])
+    assert fastest_path(graph, "A", "C") == ["A", "B", "C"]
+
+
+@pytest.mark.parametrize("alpha", [-0.1, 1.5])
+def test_recommended_path_rejects_alpha_outside_unit_interval(alpha):
+    graph = build_graph(_ports(3))
+    with pytest.raises(ValueError):
+        recommended_path(graph, "P0", "P2", _risk, alpha=alpha)
@@ -0,0 +1,36 @@
+import numpy as np
+
+from weather.simulation import seed_rng, simulate_weather, simulate_weather_batch
+
+FIELDS = ("temperature_c", "wind_ms", "pressure_hpa", "rainfall_mm_h")
+
+
+def test_batch_returns_one_value_per_point():
+    coords = np.column_stack([np.linspace(-80, 80, 500), np.linspace(-170, 170, 500)])
+    weather = simulate_weather_batch(coords, t=3.0, rng=seed_rng(0))
+    assert set(weather) == set(FIELDS)
+    for field in FIELDS:
+        assert weather[field].shape == (500,)
+        assert np.isfinite(weather[field]).all()
+
+
+def test_batch_wind_and_rain_are_non_negative():
+    coords = np.random.default_rng(1).uniform(-90, 90, (20_000, 2))
+    weather = simulate_weather_batch(coords, t=np.linspace(0, 48, 20_000), rng=seed_rng(2))
+    assert (weather["wind_ms"] >= 0).all()
+    assert (weather["rainfall_mm_h"] >= 0).all()
+
+
+def test_batch_accepts_a_single_coordinate():
+    weather = simulate_weather_batch((12.0, 45.0), t=0.0, rng=seed_rng(3))
+    assert all(weather[field].shape == (1,) for field in FIELDS)
+
+
+def test_batch_matches_scalar_model_on_average():
+    # Same deterministic terms as simulate_weather; only the noise draws differ
+    coord, t, n = (30.0, -20.0), 6.0, 20_000
+    batch = simulate_weather_batch(np.tile(coord, (n, 1)), t=t, rng=seed_rng(4))
+    rng = seed_rng(5)
+    scalar = [simulate_weather(coord, t, rng) for _ in range(n)]
+    assert abs(batch["temperature_c"].mean() - np.mean([s.temperature_c for s in scalar])) < 0.05
+    assert abs(batch["pressure_hpa"].mean() - np.mean([s.pressure_hpa for s in scalar])) < 0.05
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from routing import cheap_ruler
+from weather.simulator import REGIONS, WeatherSimulator
+
+START = datetime(2024, 6, 1, 12, 0)
+
+
+def _route(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    lats = np.cumsum(rng.uniform(-2, 2, n)).clip(-85, 85)
+    lons = (np.cumsum(rng.uniform(-3, 3, n)) + 180) % 360 - 180
+    return [tuple(p) for p in np.column_stack([lats, lons]).tolist()]
+
+
+@pytest.mark.parametrize("n", [2, 7, 50, 333])
+def test_route_sampling_matches_per_sample_sums(n):
+    coordinates = _route(n, seed=n)
+    speed_knots = 18.0
+    samples = WeatherSimulator(seed=1).get_weather_along_route(coordinates, START, speed_knots)
+
+    # Baseline: re-sum the leg distances for every sample
+    legs = [float(cheap_ruler.distance(*a, *b)) for a, b in zip(coordinates, coordinates[1:])]
+    total = sum(legs)
+    indices = np.linspace(0, n - 1, min(50, n), dtype=int)
+    assert len(samples) == len(indices)
+    for i, sample in zip(indices, samples):
+        distance_so_far = sum(legs[:i])
+        hours = (distance_so_far / total) * (total / (speed_knots * 1.852))
+        assert (sample['latitude'], sample['longitude']) == coordinates[i]
+        assert sample['distance_km'] == pytest.approx(round(distance_so_far, 2), abs=0.011)
+        assert sample['time_elapsed_hours'] == pytest.approx(round(hours, 2), abs=0.011)
+        drift = datetime.fromisoformat(sample['timestamp']) - (START + timedelta(hours=hours))
+        assert abs(drift) < timedelta(milliseconds=1)
+
+
+def test_zero_length_route_has_no_elapsed_time():
+    samples = WeatherSimulator(seed=2).get_weather_along_route([(10.0, 10.0)] * 3, START)
+    assert [s['distance_km'] for s in samples] == [0.0] * 3
+    assert [s['time_elapsed_hours'] for s in samples] == [0.0] * 3
+
+
+def test_region_ids_match_scalar_lookup():
+    simulator = WeatherSimulator(seed=3)
+    lats = np.array([0.0, 23.4, 23.5, -23.5, 45.0, 66.4, 66.5, -66.5, -89.0, 90.0])
+    expected = [simulator._get_region_for_coords(lat, 0.0) for lat in lats]
+    assert [REGIONS[r] for r in simulator._get_region_ids(lats)] == expected
+
+
+def test_route_samples_are_reproducible_with_a_seed():
+    coordinates = _route(80, seed=4)
+    first = WeatherSimulator(seed=5).get_weather_along_route(coordinates, START)
+    second = WeatherSimulator(seed=5).get_weather_along_route(coordinates, START)
+    assert first == second
+    assert all(s['region'] == REGIONS[WeatherSimulator._get_region_ids(np.array([s['latitude']]))[0]] for s in first)
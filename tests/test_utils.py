@@ -0,0 +1,82 @@
+from typing import List, Tuple
+
+import pytest
+
+from utils import calculate_bounding_box, parse_coordinates, parse_waypoints
+
+
+def _baseline_parse_coordinates(coord_str: str) -> Tuple[float, float]:
+    # The original split-based parser, kept as the reference for results and messages
+    try:
+        parts = [p.strip() for p in coord_str.split(',')]
+        if len(parts) != 2:
+            raise ValueError("Coordinate string must contain exactly one comma")
+        lat, lon = map(float, parts)
+        if not (-90 <= lat <= 90):
+            raise ValueError(f"Latitude must be between -90 and 90, got {lat}")
+        if not (-180 <= lon <= 180):
+            raise ValueError(f"Longitude must be between -180 and 180, got {lon}")
+        return lat, lon
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid coordinate format: {coord_str}. Expected 'lat,lon' (e.g., '40.7128,-74.0060')") from e
+
+
+def _baseline_parse_waypoints(waypoints_str: str) -> List[Tuple[float, float]]:
+    if not waypoints_str or not waypoints_str.strip():
+        return []
+    return [_baseline_parse_coordinates(line.strip()) for line in waypoints_str.strip().split('\n') if line.strip()]
+
+
+VALID_BLOCKS = [
+    "",
+    "   \n\n",
+    "40.7128,-74.0060",
+    "40.7128, -74.0060\n51.5074,-0.1278",
+    "  1.5 , 2.5  \n\n\t-3,+4\n",
+    "1e1,2E-1\r\n.5,-.25\r\n",
+    "90,180\n-90,-180\n0,0",
+    "12.,13.",
+    "1_0,5\n2, 3_5",        # Underscore literals float() accepts
+]
+
+INVALID_BLOCKS = [
+    "40.7128",
+    "1,2,3",
+    "abc,def",
+    "10,20\n91,0",         # Latitude out of range on the second line
+    "10,20\n0,181\n5,5",   # Longitude out of range, not the last line
+    "10,20\nnot a point\n",
+    "10,20\n,5",
+    "10,20\n 95 , 10 ",     # Error quotes the line with its inner spacing
+]
+
+
+@pytest.mark.parametrize("block", VALID_BLOCKS)
+def test_parse_waypoints_matches_baseline(block):
+    assert parse_waypoints(block) == _baseline_parse_waypoints(block)
+
+
+@pytest.mark.parametrize("block", INVALID_BLOCKS)
+def test_parse_waypoints_errors_match_baseline(block):
+    with pytest.raises(ValueError) as expected:
+        _baseline_parse_waypoints(block)
+    with pytest.raises(ValueError) as actual:
+        parse_waypoints(block)
+    assert str(actual.value) == str(expected.value)
+
+
+@pytest.mark.parametrize("coord", ["0,0", " -33.9 , 151.2 ", "95,0", "0,-200", "1;2", "", "1,2,", "1_0,5"])
+def test_parse_coordinates_matches_baseline(coord):
+    try:
+        expected = _baseline_parse_coordinates(coord)
+    except ValueError as e:
+        with pytest.raises(ValueError) as actual:
+            parse_coordinates(coord)
+        assert str(actual.value) == str(e)
+    else:
+        assert parse_coordinates(coord) == expected
+
+
+def test_calculate_bounding_box_pads_extremes():
+    box = calculate_bounding_box([(10.0, 20.0), (-5.0, 40.0), (3.0, -7.5)], padding=1.0)
+    assert box == {'north': 11.0, 'south': -6.0, 'east': 41.0, 'west': -8.5}
@@ -1,9 +1,25 @@
 """
 Utility functions for the Maritime Weather Dashboard.
 """
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterable
 import json
 import os
+import re
+
+import folium
+import numpy as np
+from folium.plugins import Draw, MeasureControl, Fullscreen, MiniMap
+from shapely.geometry import LineString
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib serializer
+    orjson = None
+
+# 'lat,lon' with optional whitespace; compiled once since parsing runs on every callback
+_NUMBER = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+_COORDINATE_RE = re.compile(rf'\s*({_NUMBER})\s*,\s*({_NUMBER})\s*')
+_WAYPOINT_LINE_RE = re.compile(rf'^[ \t\r\f\v]*({_NUMBER})[ \t\r\f\v]*,[ \t\r\f\v]*({_NUMBER})[ \t\r\f\v]*$', re.MULTILINE)
 
 
 def parse_coordinates(coord_str: str) -> Tuple[float, float]:
@@ -20,12 +36,15 @@ def parse_coordinates(coord_str: str) -> Tuple[float, float]:
         ValueError: If the input string cannot be parsed into valid coordinates
     """
     try:
-        # Remove any whitespace and split by comma
-        parts = [p.strip() for p in coord_str.split(',')]
-        if len(parts) != 2:
-            raise ValueError("Coordinate string must contain exactly one comma")
-            
-        lat, lon = map(float, parts)
+        match = _COORDINATE_RE.fullmatch(coord_str)
+        if match is not None:
+            lat, lon = float(match.group(1)), float(match.group(2))
+        else:
+            # Anything else float() accepts (e.g. '1_0') still parses as before
+            parts = [p.strip() for p in coord_str.split(',')]
+            if len(parts) != 2:
+                raise ValueError("Coordinate string must contain exactly one comma")
+            lat, lon = map(float, parts)
         
         # Basic validation
         if not (-90 <= lat <= 90):
@@ -52,13 +71,21 @@ def parse_waypoints(waypoints_str: str) -> List[Tuple[float, float]]:
     if not waypoints_str or not waypoints_str.strip():
         return []
         
-    waypoints = []
-    for line in waypoints_str.strip().split('\n'):
-        line = line.strip()
-        if line:  # Skip empty lines
-            waypoints.append(parse_coordinates(line))
-            
-    return waypoints
+    # Scan the whole block in one regex pass; fall back to per-line parsing only
+    # when some non-empty line did not match, so it raises the precise error
+    matches = list(_WAYPOINT_LINE_RE.finditer(waypoints_str))
+    lines = [line.strip() for line in waypoints_str.split('\n') if line.strip()]
+    if len(matches) != len(lines):
+        return [parse_coordinates(line) for line in lines]
+    
+    coords = np.array([m.groups() for m in matches], dtype=np.float64)
+    lats, lons = coords[:, 0], coords[:, 1]
+    if np.any(np.abs(lats) > 90) or np.any(np.abs(lons) > 180):
+        # Let parse_coordinates report the first out-of-range waypoint, quoting its line as written
+        bad = int(np.argmax((np.abs(lats) > 90) | (np.abs(lons) > 180)))
+        parse_coordinates(matches[bad].group(0).strip())
+    
+    return [(lat, lon) for lat, lon in coords.tolist()]
 
 
 def calculate_bounding_box(coordinates: List[Tuple[float, float]], padding: float = 0.1) -> Dict[str, float]:
@@ -80,110 +107,157 @@ def calculate_bounding_box(coordinates: List[Tuple[float, float]], padding: floa
             'west': 0
         }
         
-    lats = [lat for lat, _ in coordinates]
-    lons = [lon for _, lon in coordinates]
+    coords = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    mins = coords.min(axis=0)
+    maxs = coords.max(axis=0)
     
     return {
-        'north': max(lats) + padding,
-        'south': min(lats) - padding,
-        'east': max(lons) + padding,
-        'west': min(lons) - padding
+        'north': float(maxs[0]) + padding,
+        'south': float(mins[0]) - padding,
+        'east': float(maxs[1]) + padding,
+        'west': float(mins[1]) - padding
     }
 
 
-def create_folium_map(coordinates: List[Tuple[float, float]], 
-                     path_type: str = 'recommended') -> str:
+def simplify_path(path: List[Tuple[float, float]], tolerance: float = 0.01) -> List[Tuple[float, float]]:
     """
-    Create a Folium map with the given route and return it as HTML.
+    Drop route points that are invisible at display zoom (Douglas-Peucker).
     
     Args:
-        coordinates: List of (lat, lon) points along the route
-        path_type: Type of path ('fastest', 'safest', 'recommended')
+        path: List of (lat, lon) points along the route
+        tolerance: Maximum deviation from the original line, in degrees (0.01° ≈ 1 km)
         
     Returns:
-        HTML string containing the map
+        Simplified list of (lat, lon) tuples; start and end points are always kept
     """
-    import folium
-    from folium.plugins import Draw, MeasureControl, Fullscreen, MarkerCluster
-    
+    if len(path) < 3:
+        return [tuple(p) for p in path]
+    return list(LineString(path).simplify(tolerance, preserve_topology=False).coords)
+
+
+# Route line colour per path type
+_PATH_COLORS = {
+    'fastest': 'red',
+    'safest': 'green',
+    'recommended': 'blue'
+}
+
+# Extra tile layers offered on every map
+_EXTRA_TILE_LAYERS = (
+    {'tiles': 'Stamen Terrain'},
+    {'tiles': 'Stamen Toner'},
+    {
+        'tiles': 'https://tiles.openseamap.org/seamark/{z}/{x}/{y}.png',
+        'attr': 'Map data &copy; <a href="https://www.openseamap.org">OpenSeaMap</a> contributors',
+        'name': 'OpenSeaMap',
+        'overlay': True
+    }
+)
+
+
+def _base_map(coordinates: List[Tuple[float, float]]) -> folium.Map:
+    """Create an empty map centred on the given coordinates (or a world view if there are none)."""
     if not coordinates:
         # Default view if no coordinates
-        m = folium.Map(location=[20, 0], zoom_start=2, tiles='OpenStreetMap')
-    else:
-        # Calculate map center and bounds
-        bbox = calculate_bounding_box(coordinates)
-        center_lat = (bbox['north'] + bbox['south']) / 2
-        center_lon = (bbox['east'] + bbox['west']) / 2
-        
-        # Create map
-        m = folium.Map(
-            location=[center_lat, center_lon],
-            zoom_start=4,
-            tiles='OpenStreetMap',
-            control_scale=True
-        )
-        
-        # Add route line
-        if len(coordinates) > 1:
-            # Choose color based on path type
-            color_map = {
-                'fastest': 'red',
-                'safest': 'green',
-                'recommended': 'blue'
-            }
-            color = color_map.get(path_type, 'blue')
-            
-            # Add the route line
-            folium.PolyLine(
-                coordinates,
-                color=color,
-                weight=5,
-                opacity=0.8,
-                popup=f"{path_type.capitalize()} Route"
-            ).add_to(m)
-            
-            # Add start and end markers
-            start_lat, start_lon = coordinates[0]
-            end_lat, end_lon = coordinates[-1]
-            
-            folium.Marker(
-                [start_lat, start_lon],
-                popup='Start',
-                icon=folium.Icon(color='green', icon='ship', prefix='fa')
-            ).add_to(m)
-            
-            folium.Marker(
-                [end_lat, end_lon],
-                popup='End',
-                icon=folium.Icon(color='red', icon='anchor', prefix='fa')
-            ).add_to(m)
-            
-            # Add waypoint markers
-            for i, (lat, lon) in enumerate(coordinates[1:-1], 1):
-                folium.Marker(
-                    [lat, lon],
-                    popup=f'Waypoint {i}',
-                    icon=folium.Icon(color='blue', icon='map-marker', prefix='fa')
-                ).add_to(m)
+        return folium.Map(location=[20, 0], zoom_start=2, tiles='OpenStreetMap')
     
-    # Add controls
+    # Calculate map center and bounds
+    bbox = calculate_bounding_box(coordinates)
+    center_lat = (bbox['north'] + bbox['south']) / 2
+    center_lon = (bbox['east'] + bbox['west']) / 2
+    
+    return folium.Map(
+        location=[center_lat, center_lon],
+        zoom_start=4,
+        tiles='OpenStreetMap',
+        control_scale=True
+    )
+
+
+def _add_map_controls(m: folium.Map) -> None:
+    """Add drawing/measuring controls, extra tile layers and a minimap to the map."""
     Draw(export=True).add_to(m)
     MeasureControl().add_to(m)
     Fullscreen().add_to(m)
     
-    # Add tile layers
-    folium.TileLayer('Stamen Terrain').add_to(m)
-    folium.TileLayer('Stamen Toner').add_to(m)
-    folium.TileLayer('OpenSeaMap').add_to(m)
+    for layer in _EXTRA_TILE_LAYERS:
+        folium.TileLayer(**layer).add_to(m)
     folium.LayerControl().add_to(m)
     
-    # Add a minimap
-    from folium.plugins import MiniMap
-    minimap = MiniMap()
-    m.add_child(minimap)
+    m.add_child(MiniMap())
+
+
+def build_folium_map(coordinates: List[Tuple[float, float]], 
+                     path_type: str = 'recommended',
+                     extra_layers: Iterable[folium.map.Layer] = ()) -> folium.Map:
+    """
+    Create a Folium map with the given route.
+    
+    Args:
+        coordinates: List of (lat, lon) points along the route
+        path_type: Type of path ('fastest', 'safest', 'recommended')
+        extra_layers: Additional layers to add before the layer control
+        
+    Returns:
+        The folium.Map object
+    """
+    m = _base_map(coordinates)
+    
+    # Add route line
+    if len(coordinates) > 1:
+        # Add the route line
+        folium.PolyLine(
+            coordinates,
+            color=_PATH_COLORS.get(path_type, 'blue'),
+            weight=5,
+            opacity=0.8,
+            popup=f"{path_type.capitalize()} Route"
+        ).add_to(m)
+        
+        # Add start and end markers
+        start_lat, start_lon = coordinates[0]
+        end_lat, end_lon = coordinates[-1]
+        
+        folium.Marker(
+            [start_lat, start_lon],
+            popup='Start',
+            icon=folium.Icon(color='green', icon='ship', prefix='fa')
+        ).add_to(m)
+        
+        folium.Marker(
+            [end_lat, end_lon],
+            popup='End',
+            icon=folium.Icon(color='red', icon='anchor', prefix='fa')
+        ).add_to(m)
+        
+        # Add waypoint markers
+        for i, (lat, lon) in enumerate(coordinates[1:-1], 1):
+            folium.Marker(
+                [lat, lon],
+                popup=f'Waypoint {i}',
+                icon=folium.Icon(color='blue', icon='map-marker', prefix='fa')
+            ).add_to(m)
+    
+    for layer in extra_layers:
+        layer.add_to(m)
     
-    # Return the map as HTML
-    return m._repr_html_()
+    _add_map_controls(m)
+    return m
+
+
+def create_folium_map(coordinates: List[Tuple[float, float]], 
+                     path_type: str = 'recommended') -> str:
+    """
+    Create a Folium map with the given route and return it as HTML.
+    
+    Args:
+        coordinates: List of (lat, lon) points along the route
+        path_type: Type of path ('fastest', 'safest', 'recommended')
+        
+    Returns:
+        HTML string containing the map
+    """
+    return build_folium_map(coordinates, path_type)._repr_html_()
 
 
 def save_route_to_file(route_data: Dict[str, Any], filename: str = None) -> str:
@@ -212,8 +286,12 @@ def save_route_to_file(route_data: Dict[str, Any], filename: str = None) -> str:
     
     # Save to file
     filepath = os.path.join('data', 'routes', filename)
-    with open(filepath, 'w') as f:
-        json.dump(route_data, f, indent=2)
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(route_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(route_data, f, indent=2)
         
     return filepath
 
@@ -33,3 +33,24 @@ def simulate_weather(coord: Coordinate, t: float, rng: np.random.Generator | Non
     return WeatherSample(temperature, max(0.0, wind), pressure, rainfall)
 
 
+def simulate_weather_batch(
+    coords: np.ndarray, t: np.ndarray | float, rng: np.random.Generator | None = None
+) -> Dict[str, np.ndarray]:
+    # Vectorized simulate_weather over (N, 2) lat/lon coords; one RNG draw per field for all points
+    if rng is None:
+        rng = seed_rng()
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    n = coords.shape[0]
+    lat, lon = coords[:, 0], coords[:, 1]
+    t = np.broadcast_to(np.asarray(t, dtype=np.float64), (n,))
+    base_temp = 27 - np.abs(lat) * 0.2 + 2 * np.sin(t / 6.0)
+    temperature = base_temp + rng.normal(0, 0.8, size=n)
+    wind = 8 + 4 * np.sin((lat + lon + t) / 10.0) + rng.normal(0, 1.0, size=n)
+    pressure = 1013 + 6 * np.cos(t / 12.0) + rng.normal(0, 1.0, size=n)
+    rainfall = np.maximum(0.0, rng.gamma(2.0, 0.6, size=n) - 0.8)
+    return {
+        "temperature_c": temperature,
+        "wind_ms": np.maximum(0.0, wind),
+        "pressure_hpa": pressure,
+        "rainfall_mm_h": rainfall,
+    }
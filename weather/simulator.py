@@ -1,15 +1,19 @@
 import numpy as np
 from typing import List, Tuple, Dict
 from datetime import datetime, timedelta
-import random
+
+from routing import cheap_ruler
+
+# Climate regions in the order of their integer ids, by increasing |latitude|
+REGIONS = ('tropical', 'temperate', 'polar')
+REGION_LAT_LIMITS = (23.5, 66.5)
 
 class WeatherSimulator:
     def __init__(self, seed: int = None):
         """Initialize the weather simulator with an optional seed for reproducibility."""
-        if seed is not None:
-            np.random.seed(seed)
-            random.seed(seed)
-            
+        # Single generator for every draw, so routes can sample whole field vectors at once
+        self.rng = np.random.default_rng(seed)
+        
         # Initialize base weather patterns
         self.base_temperature = 20.0  # Base temperature in Celsius
         self.base_pressure = 1013.25  # Base pressure in hPa
@@ -46,13 +50,18 @@ class WeatherSimulator:
     
     def _get_region_for_coords(self, lat: float, lon: float) -> str:
         """Determine the climate region based on latitude and longitude."""
-        if abs(lat) < 23.5:
+        if abs(lat) < REGION_LAT_LIMITS[0]:
             return 'tropical'
-        elif abs(lat) < 66.5:
+        elif abs(lat) < REGION_LAT_LIMITS[1]:
             return 'temperate'
         else:
             return 'polar'
     
+    @staticmethod
+    def _get_region_ids(lats: np.ndarray) -> np.ndarray:
+        """Vectorized _get_region_for_coords: index into REGIONS for every latitude."""
+        return np.searchsorted(REGION_LAT_LIMITS, np.abs(lats), side='right')
+    
     def _generate_weather_params(self, region: str, time: datetime) -> Dict:
         """Generate base weather parameters for a given region and time."""
         pattern = self.weather_patterns[region]
@@ -62,7 +71,7 @@ class WeatherSimulator:
         seasonal_factor = np.sin(2 * np.pi * (day_of_year - 80) / 365)  # Peaks at summer solstice
         
         # Generate base values with some randomness
-        temp = np.random.uniform(*pattern['temp_range'])
+        temp = self.rng.uniform(*pattern['temp_range'])
         temp += 10 * seasonal_factor  # Amplify seasonal effect
         
         # Add diurnal variation (colder at night)
@@ -70,25 +79,25 @@ class WeatherSimulator:
         diurnal_factor = np.cos(2 * np.pi * (hour - 14) / 24)  # Warmest at 2 PM
         temp += 5 * diurnal_factor
         
-        pressure = np.random.uniform(*pattern['pressure_range'])
-        humidity = np.random.uniform(*pattern['humidity_range'])
+        pressure = self.rng.uniform(*pattern['pressure_range'])
+        humidity = self.rng.uniform(*pattern['humidity_range'])
         
         # Generate wind speed with some correlation to pressure gradients
-        base_wind = np.random.uniform(*pattern['wind_speed_range'])
-        wind_speed = base_wind * (1 + 0.2 * np.random.normal())
+        base_wind = self.rng.uniform(*pattern['wind_speed_range'])
+        wind_speed = base_wind * (1 + 0.2 * self.rng.normal())
         
         # Determine precipitation
-        is_raining = np.random.random() < pattern['precipitation_prob']
-        is_storm = is_raining and (np.random.random() < pattern['storm_prob'])
+        is_raining = self.rng.random() < pattern['precipitation_prob']
+        is_storm = is_raining and (self.rng.random() < pattern['storm_prob'])
         
         if is_storm:
             # Storm conditions
             wind_speed *= 2.5
             pressure *= 0.95  # Lower pressure in storms
-            precipitation = np.random.uniform(10, 50)  # mm/h
+            precipitation = self.rng.uniform(10, 50)  # mm/h
         elif is_raining:
             # Normal rain
-            precipitation = np.random.uniform(1, 10)  # mm/h
+            precipitation = self.rng.uniform(1, 10)  # mm/h
         else:
             precipitation = 0
         
@@ -101,12 +110,82 @@ class WeatherSimulator:
             'pressure': round(pressure, 1),  # hPa
             'humidity': round(humidity),     # %
             'wind_speed': round(wind_speed, 1),  # m/s
-            'wind_direction': np.random.uniform(0, 360),  # degrees
+            'wind_direction': self.rng.uniform(0, 360),  # degrees
             'precipitation': round(precipitation, 1),  # mm/h
             'wave_height': round(wave_height, 1),  # m
             'conditions': self._get_conditions(is_raining, is_storm, wind_speed)
         }
     
+    def _generate_weather_params_batch(self, region_ids: np.ndarray, times: List[datetime]) -> List[Dict]:
+        """Vectorized _generate_weather_params: one generator call per field for all points."""
+        n = len(region_ids)
+        # One row per region, gathered per point by region id
+        patterns = [self.weather_patterns[region] for region in REGIONS]
+        
+        def table(key):
+            return np.array([p[key] for p in patterns], dtype=np.float64)[region_ids]
+        
+        def bounds(key):
+            ranges = table(key)
+            return ranges[:, 0], ranges[:, 1]
+        
+        # Seasonal (peaks at summer solstice) and diurnal (warmest at 2 PM) variation
+        day_of_year = np.array([t.timetuple().tm_yday for t in times], dtype=np.float64)
+        hour = np.array([t.hour for t in times], dtype=np.float64)
+        seasonal_factor = np.sin(2 * np.pi * (day_of_year - 80) / 365)
+        diurnal_factor = np.cos(2 * np.pi * (hour - 14) / 24)
+        
+        temp = self.rng.uniform(*bounds('temp_range'), size=n) + 10 * seasonal_factor + 5 * diurnal_factor
+        pressure = self.rng.uniform(*bounds('pressure_range'), size=n)
+        humidity = self.rng.uniform(*bounds('humidity_range'), size=n)
+        
+        # Generate wind speed with some correlation to pressure gradients
+        base_wind = self.rng.uniform(*bounds('wind_speed_range'), size=n)
+        wind_speed = base_wind * (1 + 0.2 * self.rng.normal(size=n))
+        
+        # Determine precipitation
+        is_raining = self.rng.random(n) < table('precipitation_prob')
+        is_storm = is_raining & (self.rng.random(n) < table('storm_prob'))
+        
+        # Storms: stronger wind, lower pressure, heavy rain (mm/h)
+        wind_speed = np.where(is_storm, wind_speed * 2.5, wind_speed)
+        pressure = np.where(is_storm, pressure * 0.95, pressure)
+        precipitation = np.where(
+            is_storm, self.rng.uniform(10, 50, size=n),
+            np.where(is_raining, self.rng.uniform(1, 10, size=n), 0.0)
+        )
+        
+        # Calculate wave height based on wind speed and fetch
+        fetch = 100  # km - simplified for this simulation
+        wave_height = 0.0248 * (wind_speed ** 2) * (fetch ** 0.5) / 1000  # In meters
+        wind_direction = self.rng.uniform(0, 360, size=n)
+        
+        columns = zip(
+            np.round(temp, 1).tolist(),
+            np.round(pressure, 1).tolist(),
+            np.rint(humidity).astype(int).tolist(),
+            np.round(wind_speed, 1).tolist(),
+            wind_direction.tolist(),
+            np.round(precipitation, 1).tolist(),
+            np.round(wave_height, 1).tolist(),
+            is_raining.tolist(),
+            is_storm.tolist(),
+            wind_speed.tolist()
+        )
+        return [
+            {
+                'temperature': t,  # °C
+                'pressure': p,  # hPa
+                'humidity': h,  # %
+                'wind_speed': w,  # m/s
+                'wind_direction': d,  # degrees
+                'precipitation': pr,  # mm/h
+                'wave_height': wh,  # m
+                'conditions': self._get_conditions(rain, storm, raw_wind)
+            }
+            for t, p, h, w, d, pr, wh, rain, storm, raw_wind in columns
+        ]
+    
     def _get_conditions(self, is_raining: bool, is_storm: bool, wind_speed: float) -> str:
         """Generate human-readable weather conditions."""
         if is_storm:
@@ -161,54 +240,43 @@ class WeatherSimulator:
         weather_data = []
         current_time = start_time
         
-        # Calculate distances between points
-        distances = []
-        for i in range(len(coordinates) - 1):
-            dist = self._haversine(coordinates[i], coordinates[i+1])
-            distances.append(dist)
+        # Calculate distances between consecutive points in one vectorized call
+        coords = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        distances = cheap_ruler.distance(coords[:-1, 0], coords[:-1, 1], coords[1:, 0], coords[1:, 1])
         
-        total_distance = sum(distances)
+        # Cumulative distance to every point, so each sample is an O(1) lookup
+        cumulative = np.concatenate(([0.0], np.cumsum(distances)))
+        total_distance = float(cumulative[-1])
         total_hours = total_distance / (speed_knots * 1.852)  # Convert knots to km/h
         
         # Sample points along the route
         num_samples = min(50, len(coordinates))  # Limit number of samples
         sample_indices = np.linspace(0, len(coordinates) - 1, num_samples, dtype=int)
         
-        for i in sample_indices:
-            if i >= len(coordinates):
-                continue
-                
-            # Calculate time at this point
-            distance_so_far = sum(distances[:i]) if i > 0 else 0
-            time_elapsed = (distance_so_far / total_distance) * total_hours
-            point_time = start_time + timedelta(hours=time_elapsed)
-            
-            # Get weather at this point and time
+        # Distance covered and time elapsed at each sample
+        distances_so_far = cumulative[sample_indices]
+        if total_distance > 0:
+            times_elapsed = distances_so_far / total_distance * total_hours
+        else:
+            times_elapsed = np.zeros(len(sample_indices))
+        distances_so_far = distances_so_far.tolist()
+        times_elapsed = times_elapsed.tolist()
+        point_times = [start_time + timedelta(hours=t) for t in times_elapsed]
+        region_ids = self._get_region_ids(coords[sample_indices, 0])
+        regions = [REGIONS[r] for r in region_ids.tolist()]
+        
+        samples = self._generate_weather_params_batch(region_ids, point_times)
+        for i, weather, region, point_time, distance_so_far, time_elapsed in zip(
+                sample_indices, samples, regions, point_times, distances_so_far, times_elapsed):
             lat, lon = coordinates[i]
-            weather = self.get_weather_at_point(lat, lon, point_time)
-            weather['distance_km'] = round(distance_so_far, 2)
-            weather['time_elapsed_hours'] = round(time_elapsed, 2)
-            
+            weather.update({
+                'latitude': lat,
+                'longitude': lon,
+                'timestamp': point_time.isoformat(),
+                'region': region,
+                'distance_km': round(distance_so_far, 2),
+                'time_elapsed_hours': round(time_elapsed, 2)
+            })
             weather_data.append(weather)
         
         return weather_data
-    
-    @staticmethod
-    def _haversine(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-        """Calculate the great circle distance between two points in kilometers."""
-        from math import radians, sin, cos, sqrt, atan2
-        
-        lat1, lon1 = coord1
-        lat2, lon2 = coord2
-        
-        # Convert decimal degrees to radians
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        radius_earth = 6371  # Radius of Earth in kilometers
-        
-        return radius_earth * c